@@ -78,21 +78,30 @@ if ! python3 -c "import sys; exit(0 if sys.version_info >= (3, 8) else 1)"; then
     echo -e "${YELLOW}[bluera-knowledge] Python ${python_version} detected. Python 3.8+ recommended for crawl4ai${NC}"
 fi
 
-# Check if crawl4ai is installed
-if python3 -c "import crawl4ai" 2>/dev/null; then
-    # Already installed - get version
+# Check crawl4ai and the worker's orjson dependency separately so only missing ones are installed
+missing_packages=""
+if ! python3 -c "import crawl4ai" 2>/dev/null; then
+    missing_packages="crawl4ai"
+fi
+if ! python3 -c "import orjson" 2>/dev/null; then
+    missing_packages="${missing_packages:+${missing_packages} }orjson"
+fi
+
+if [ -z "$missing_packages" ]; then
+    # Already installed - get versions
     crawl4ai_version=$(python3 -c "import crawl4ai; print(crawl4ai.__version__)" 2>/dev/null || echo "unknown")
-    echo -e "${GREEN}[bluera-knowledge] crawl4ai ${crawl4ai_version} is installed ✓${NC}"
+    orjson_version=$(python3 -c "import orjson; print(orjson.__version__)" 2>/dev/null || echo "unknown")
+    echo -e "${GREEN}[bluera-knowledge] crawl4ai ${crawl4ai_version} and orjson ${orjson_version} are installed ✓${NC}"
     # Ensure Playwright browser is installed for headless crawling
     install_playwright_browser
     exit 0
 fi
 
-# crawl4ai not installed - attempt installation
-echo -e "${YELLOW}[bluera-knowledge] crawl4ai not found. Web crawling features will be unavailable.${NC}"
+# Some packages missing - attempt installation
+echo -e "${YELLOW}[bluera-knowledge] ${missing_packages} not found. Web crawling features will be unavailable.${NC}"
 echo ""
-echo -e "${YELLOW}To enable web crawling, install crawl4ai:${NC}"
-echo -e "  ${GREEN}pip install crawl4ai${NC}"
+echo -e "${YELLOW}To enable web crawling, install ${missing_packages}:${NC}"
+echo -e "  ${GREEN}pip install ${missing_packages}${NC}"
 echo ""
 
 # Check if we should auto-install
@@ -108,16 +117,16 @@ if command -v pip3 &> /dev/null || command -v pip &> /dev/null; then
 
     # Try with --break-system-packages for PEP 668 environments (Python 3.11+)
     # This is needed on modern Python versions (macOS Homebrew, some Linux distros)
-    if $PIP_CMD install --quiet --break-system-packages crawl4ai 2>/dev/null; then
-        echo -e "${GREEN}[bluera-knowledge] Successfully installed crawl4ai ✓${NC}"
+    if $PIP_CMD install --quiet --break-system-packages $missing_packages 2>/dev/null; then
+        echo -e "${GREEN}[bluera-knowledge] Successfully installed ${missing_packages} ✓${NC}"
         crawl4ai_version=$(python3 -c "import crawl4ai; print(crawl4ai.__version__)" 2>/dev/null || echo "installed")
         echo -e "${GREEN}[bluera-knowledge] crawl4ai ${crawl4ai_version} ready${NC}"
         # Install Playwright browser for headless crawling
         install_playwright_browser
     else
         # Fallback: try without --break-system-packages for older Python
-        if $PIP_CMD install --quiet --user crawl4ai 2>/dev/null; then
-            echo -e "${GREEN}[bluera-knowledge] Successfully installed crawl4ai ✓${NC}"
+        if $PIP_CMD install --quiet --user $missing_packages 2>/dev/null; then
+            echo -e "${GREEN}[bluera-knowledge] Successfully installed ${missing_packages} ✓${NC}"
             crawl4ai_version=$(python3 -c "import crawl4ai; print(crawl4ai.__version__)" 2>/dev/null || echo "installed")
             echo -e "${GREEN}[bluera-knowledge] crawl4ai ${crawl4ai_version} ready${NC}"
             # Install Playwright browser for headless crawling
@@ -126,13 +135,13 @@ if command -v pip3 &> /dev/null || command -v pip &> /dev/null; then
             echo -e "${RED}[bluera-knowledge] Auto-installation failed${NC}"
             echo ""
             echo -e "${YELLOW}For Python 3.11+ (externally-managed), install manually:${NC}"
-            echo -e "  ${GREEN}pip install --break-system-packages crawl4ai${NC}"
+            echo -e "  ${GREEN}pip install --break-system-packages ${missing_packages}${NC}"
             echo -e "${YELLOW}Or use a virtual environment:${NC}"
-            echo -e "  ${GREEN}python3 -m venv venv && source venv/bin/activate && pip install crawl4ai${NC}"
+            echo -e "  ${GREEN}python3 -m venv venv && source venv/bin/activate && pip install ${missing_packages}${NC}"
         fi
     fi
 else
-    echo -e "${YELLOW}pip not found. Please install crawl4ai manually.${NC}"
+    echo -e "${YELLOW}pip not found. Please install ${missing_packages} manually.${NC}"
 fi
 
 # Always exit 0 to not block the session
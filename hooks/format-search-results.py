@@ -4,79 +4,63 @@ PostToolUse hook to format mcp__bluera-knowledge__search results
 into a fixed-width table with deterministic output.
 """
 
+import io
 import json
 import sys
 import os
 
+try:
+    import orjson  # Faster parsing of large tool results (installed by check-dependencies.sh)
+except ImportError:
+    orjson = None
+
 # Column widths (content only, not including | separators)
 SCORE_WIDTH = 6   # Right-aligned: " 1.00 "
 STORE_WIDTH = 12  # Left-aligned: "store       "
 FILE_WIDTH = 45   # Left-aligned: "path/to/file..."
 PURPOSE_WIDTH = 48  # Left-aligned: "Purpose text..."
 
+# Table header and separator depend only on the column widths, so build them once
+TABLE_HEADER = f"| {'Score'.rjust(SCORE_WIDTH)} | {'Store'.ljust(STORE_WIDTH)} | {'File'.ljust(FILE_WIDTH)} | {'Purpose'.ljust(PURPOSE_WIDTH)} |"
+# Separator: Score is right-aligned (colon at end), others are left-aligned
+# The +2 accounts for the spaces around content, -1 for the colon on Score column
+TABLE_SEPARATOR = f"|{'-' * (SCORE_WIDTH + 1)}:|{'-' * (STORE_WIDTH + 2)}|{'-' * (FILE_WIDTH + 2)}|{'-' * (PURPOSE_WIDTH + 2)}|"
+
+# Complete output for an empty result set; only the query varies
+EMPTY_RESULTS_TEMPLATE = (
+    "## Search Results for \"{query}\"\n"
+    "\n"
+    "No results found for \"{query}\"\n"
+    "\n"
+    "Try:\n"
+    "- Broadening your search terms\n"
+    "- Checking if the relevant stores are indexed\n"
+    "- Using /bluera-knowledge:stores to see available stores\n"
+)
+
 
 def truncate(text: str, max_len: int) -> str:
-    """Truncate text with ellipsis if needed."""
-    if len(text) <= max_len:
-        return text
+    """Truncate over-long text with an ellipsis (callers check the length first)."""
     return text[:max_len - 3] + "..."
 
 
-def format_score(score: float) -> str:
-    """Format score as right-aligned fixed-width string."""
-    return f"{score:5.2f}".rjust(SCORE_WIDTH)
-
-
-def format_store(store_name: str) -> str:
-    """Format store name as left-aligned fixed-width string."""
-    truncated = truncate(store_name, STORE_WIDTH)
-    return truncated.ljust(STORE_WIDTH)
-
-
-def format_file(location: str, repo_root: str) -> str:
-    """Format file path as left-aligned fixed-width string."""
-    # Strip repo root prefix
-    if repo_root and location.startswith(repo_root):
-        path = location[len(repo_root):].lstrip("/")
-    else:
-        path = location
-    truncated = truncate(path, FILE_WIDTH)
-    return truncated.ljust(FILE_WIDTH)
-
-
-def format_purpose(purpose: str) -> str:
-    """Format purpose as left-aligned fixed-width string."""
-    # Clean up purpose text
-    clean = purpose.replace("\n", " ").strip()
-    truncated = truncate(clean, PURPOSE_WIDTH)
-    return truncated.ljust(PURPOSE_WIDTH)
-
-
 def format_table(results: list, query: str) -> str:
-    """Format search results into a fixed-width markdown table."""
-    lines = []
+    """Format search results into a fixed-width markdown table (newline-terminated)."""
+    if not results:
+        return EMPTY_RESULTS_TEMPLATE.format(query=query)
 
-    # Header
-    lines.append(f"## Search Results for \"{query}\"")
-    lines.append("")
+    buf = io.StringIO()
+    write = buf.write
 
-    if not results:
-        lines.append(f"No results found for \"{query}\"")
-        lines.append("")
-        lines.append("Try:")
-        lines.append("- Broadening your search terms")
-        lines.append("- Checking if the relevant stores are indexed")
-        lines.append("- Using /bluera-knowledge:stores to see available stores")
-        return "\n".join(lines)
+    # Header
+    write(f"## Search Results for \"{query}\"\n")
+    write("\n")
 
     # Table header
-    header = f"| {'Score'.rjust(SCORE_WIDTH)} | {'Store'.ljust(STORE_WIDTH)} | {'File'.ljust(FILE_WIDTH)} | {'Purpose'.ljust(PURPOSE_WIDTH)} |"
-    # Separator: Score is right-aligned (colon at end), others are left-aligned
-    # The +2 accounts for the spaces around content, -1 for the colon on Score column
-    separator = f"|{'-' * (SCORE_WIDTH + 1)}:|{'-' * (STORE_WIDTH + 2)}|{'-' * (FILE_WIDTH + 2)}|{'-' * (PURPOSE_WIDTH + 2)}|"
-
-    lines.append(header)
-    lines.append(separator)
+    write(TABLE_HEADER)
+    write("\n")
+    write(TABLE_SEPARATOR)
+    write("\n")
 
     # Data rows
     for result in results:
@@ -87,19 +71,35 @@ def format_table(results: list, query: str) -> str:
         repo_root = summary.get("repoRoot", "")
         purpose = summary.get("purpose", "")
 
-        row = f"| {format_score(score)} | {format_store(store_name)} | {format_file(location, repo_root)} | {format_purpose(purpose)} |"
-        lines.append(row)
+        # Strip repo root prefix
+        if repo_root and location.startswith(repo_root):
+            path = location[len(repo_root):].lstrip("/")
+        else:
+            path = location
+        # Clean up purpose text
+        purpose = purpose.replace("\n", " ").strip()
+
+        if len(store_name) > STORE_WIDTH:
+            store_name = truncate(store_name, STORE_WIDTH)
+        if len(path) > FILE_WIDTH:
+            path = truncate(path, FILE_WIDTH)
+        if len(purpose) > PURPOSE_WIDTH:
+            purpose = truncate(purpose, PURPOSE_WIDTH)
+
+        # Format specs pad each cell in place: score right-aligned, text left-aligned
+        write(f"| {score:>{SCORE_WIDTH}.2f} | {store_name:<{STORE_WIDTH}} | {path:<{FILE_WIDTH}} | {purpose:<{PURPOSE_WIDTH}} |\n")
 
-    lines.append("")
-    lines.append(f"**Found**: {len(results)} results")
+    write("\n")
+    write(f"**Found**: {len(results)} results\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def main():
     try:
-        # Read hook input from stdin
-        input_data = json.load(sys.stdin)
+        # Read hook input from stdin as raw bytes (both parsers accept UTF-8 bytes)
+        raw_input = sys.stdin.buffer.read()
+        input_data = orjson.loads(raw_input) if orjson else json.loads(raw_input)
 
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
@@ -118,9 +118,10 @@ def main():
 
         # Output the formatted table
         # For PostToolUse, stdout is shown in the transcript
-        print(formatted)
+        sys.stdout.write(formatted)
 
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         print(f"Error parsing hook input: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
@@ -4,8 +4,16 @@ import json
 import asyncio
 import os
 import ast
+import contextlib
+import functools
+import hashlib
+import stat
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any
 
+import orjson
+
 # Suppress crawl4ai logging before import
 os.environ['CRAWL4AI_VERBOSE'] = '0'
 
@@ -13,32 +21,224 @@ os.environ['CRAWL4AI_VERBOSE'] = '0'
 import io
 sys.stderr = io.StringIO()
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+# crawl4ai (Playwright, lxml, ...) is imported on the first crawl request, so a
+# worker that only parses Python never pays for it
 
-async def fetch_headless(url: str):
-    """Fetch URL with headless browser (Playwright via crawl4ai)"""
-    browser_config = BrowserConfig(headless=True, verbose=False)
-    run_config = CrawlerRunConfig(
-        wait_for="js:() => document.readyState === 'complete'",
-        page_timeout=30000
-    )
+JSONRPC_VERSION = '2.0'
 
-    async with AsyncWebCrawler(config=browser_config, verbose=False) as crawler:
-        result = await crawler.arun(url, config=run_config)
+# Maximum number of requests processed concurrently
+MAX_CONCURRENT_REQUESTS = 8
 
-        if not result.success:
-            raise Exception(f"Crawl failed: {result.error_message}")
+# parse_python requests carry whole source files, so allow long request lines. Longer
+# lines get an id-less error, so the bridge rejects them first (MAX_REQUEST_LINE_BYTES)
+STDIN_LINE_LIMIT = 64 * 1024 * 1024
 
-        # Combine internal and external links - let TypeScript filter by domain
-        all_links = []
-        if isinstance(result.links, dict):
-            all_links = result.links.get("internal", []) + result.links.get("external", [])
+# Crawl requests arriving within this window are coalesced into one arun_many call
+CRAWL_BATCH_WINDOW_S = 0.01
+CRAWL_BATCH_MAX_URLS = MAX_CONCURRENT_REQUESTS
 
-        return {
-            "html": result.html or '',
-            "markdown": result.markdown or result.cleaned_html or '',
-            "links": all_links
-        }
+# Parse results are cached by source hash, since incremental indexing re-parses
+# unchanged files; small sources parse in microseconds and skip the cache
+AST_CACHE_MAX_ENTRIES = 256
+AST_CACHE_MIN_CODE_LENGTH = 2048
+
+# Headless fetches wait for the page to finish loading before extracting content
+PAGE_READY_JS = "js:() => document.readyState === 'complete'"
+HEADLESS_PAGE_TIMEOUT_MS = 30000
+
+def ok_response(req_id: Any, result: Any) -> Dict[str, Any]:
+    """Build the JSON-RPC success response for a request"""
+    return {'jsonrpc': JSONRPC_VERSION, 'id': req_id, 'result': result}
+
+def error_response(req_id: Any, message: str) -> Dict[str, Any]:
+    """Build the JSON-RPC error response used for every failed request"""
+    return {'jsonrpc': JSONRPC_VERSION, 'id': req_id, 'error': {'code': -1, 'message': message}}
+
+def emit(response: Dict[str, Any] | List[Dict[str, Any]]) -> None:
+    """Write a JSON-RPC response (or batch of responses) as a single line on stdout"""
+    try:
+        payload = orjson.dumps(response)
+    except TypeError:
+        # orjson rejects types the stdlib can coerce (e.g. non-str keys)
+        payload = json.dumps(response, default=str).encode('utf-8')
+
+    # Flush any text-layer output (crawl4ai progress) so lines never interleave
+    sys.stdout.flush()
+    stdout = sys.stdout.buffer
+    stdout.write(payload)
+    stdout.write(b"\n")
+    stdout.flush()
+
+@functools.cache
+def headless_run_config():
+    """Build the run config shared by every headless fetch (read-only during arun)"""
+    from crawl4ai import CrawlerRunConfig
+
+    return CrawlerRunConfig(
+        wait_for=PAGE_READY_JS,
+        page_timeout=HEADLESS_PAGE_TIMEOUT_MS
+    )
+
+@functools.cache
+def batch_run_config():
+    """Stream arun_many results so each request completes as soon as its own URL does"""
+    from crawl4ai import CrawlerRunConfig
+
+    return CrawlerRunConfig(stream=True)
+
+def batch_dispatcher():
+    """Dispatcher for one arun_many call (dispatchers keep per-run queues, so not shared)"""
+    from crawl4ai import MemoryAdaptiveDispatcher
+
+    # SemaphoreDispatcher can't stream, and the default MemoryAdaptiveDispatcher
+    # rate-limits per domain (1-3s between requests), so build one without a limiter
+    return MemoryAdaptiveDispatcher(max_session_permit=CRAWL_BATCH_MAX_URLS, rate_limiter=None)
+
+class Crawlers:
+    """Long-lived crawl4ai browsers, started on first use and closed with the exit stack"""
+
+    def __init__(self, stack: contextlib.AsyncExitStack):
+        self._stack = stack
+        self._lock = asyncio.Lock()
+        self._default = None
+        self._headless = None
+
+    async def default(self):
+        """Return the crawler used for crawl requests"""
+        if self._default is None:
+            async with self._lock:
+                if self._default is None:
+                    from crawl4ai import AsyncWebCrawler
+
+                    # Disable verbose logging in crawl4ai
+                    self._default = await self._stack.enter_async_context(
+                        AsyncWebCrawler(verbose=False)
+                    )
+        return self._default
+
+    async def headless(self):
+        """Return the headless crawler reused by every fetch_headless request"""
+        if self._headless is None:
+            async with self._lock:
+                if self._headless is None:
+                    from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+                    # Browser startup dominates latency for small pages, so start it once
+                    browser_config = BrowserConfig(headless=True, verbose=False)
+                    self._headless = await self._stack.enter_async_context(
+                        AsyncWebCrawler(config=browser_config, verbose=False)
+                    )
+        return self._headless
+
+class CrawlBatcher:
+    """Coalesces concurrent crawl requests into shared crawl4ai arun_many calls"""
+
+    def __init__(self, crawlers: Crawlers):
+        self._crawlers = crawlers
+        self._queue = asyncio.Queue()
+        self._collector = None
+        self._batches = set()
+
+    async def crawl(self, url: str):
+        """Queue a URL for the next batch and wait for its CrawlResult"""
+        if self._collector is None:
+            self._collector = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((url, future))
+        return await future
+
+    async def close(self):
+        """Stop collecting batches (in-flight requests have already drained)"""
+        if self._collector is not None:
+            self._collector.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._collector
+
+    async def _collect(self):
+        """Gather queued requests for up to CRAWL_BATCH_WINDOW_S or CRAWL_BATCH_MAX_URLS"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + CRAWL_BATCH_WINDOW_S
+
+            # Nothing else is queued (e.g. a client awaiting crawls one at a time) - don't
+            # hold a lone request for the window
+            while len(batch) < CRAWL_BATCH_MAX_URLS and not (len(batch) == 1 and self._queue.empty()):
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Run the batch in the background so the next one can start collecting
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch):
+        """Crawl a batch, resolving each request's future as soon as its URL finishes"""
+        error = None
+        try:
+            crawler = await self._crawlers.default()
+            urls = list(dict.fromkeys(url for url, _ in batch))
+            crawled = set()
+
+            if len(urls) > 1:
+                try:
+                    async for result in await crawler.arun_many(urls=urls, config=batch_run_config(), dispatcher=batch_dispatcher()):
+                        # Results stream in completion order, so match them back by URL
+                        crawled.add(result.url)
+                        resolve_futures(batch, result.url, result)
+                except Exception as e:
+                    print(f"arun_many failed, crawling the remaining URLs one by one: {e}", file=sys.stderr)
+
+            # Not matched back (a single URL, crawl4ai normalised it, or arun_many failed)
+            missing = [url for url in urls if url not in crawled]
+            outcomes = await asyncio.gather(*(crawler.arun(url=url) for url in missing), return_exceptions=True)
+            for url, outcome in zip(missing, outcomes):
+                resolve_futures(batch, url, outcome)
+        except Exception as e:
+            error = e
+        finally:
+            # Never leave a request waiting (and holding its slot) on a future nobody resolves
+            for url, future in batch:
+                if not future.done():
+                    future.set_exception(error or RuntimeError(f"Crawl of {url} ended without a result"))
+
+def resolve_futures(batch, url: str, outcome: Any) -> None:
+    """Resolve every pending future in a batch waiting on URL with a result or exception"""
+    for queued_url, future in batch:
+        if queued_url != url or future.done():
+            continue
+        if isinstance(outcome, BaseException):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
+
+def combine_links(links: Any) -> List[Any]:
+    """Concatenate crawl4ai's internal and external links (a dict of lists) into one list"""
+    if not isinstance(links, dict):
+        return []
+    return (links.get('internal') or []) + (links.get('external') or [])
+
+async def fetch_headless(crawler, url: str):
+    """Fetch URL with the long-lived headless browser (Playwright via crawl4ai)"""
+    result = await crawler.arun(url, config=headless_run_config())
+
+    if not result.success:
+        raise Exception(f"Crawl failed: {result.error_message}")
+
+    # Combine internal and external links - let TypeScript filter by domain
+    all_links = combine_links(result.links)
+
+    return {
+        "html": result.html or '',
+        "markdown": result.markdown or result.cleaned_html or '',
+        "links": all_links
+    }
 
 def is_exported(node: ast.AST) -> bool:
     """Check if a function or class is exported (Python doesn't have explicit exports, check if starts with '_')"""
@@ -46,6 +246,21 @@ def is_exported(node: ast.AST) -> bool:
         return not node.name.startswith('_')
     return False
 
+def format_annotation(node: ast.expr) -> str:
+    """Format a type annotation, with fast paths that skip ast.unparse for common simple forms"""
+    if isinstance(node, ast.Name):
+        return node.id
+    # Only Name/Attribute chains - other receivers may need parentheses that unparse adds
+    if isinstance(node, ast.Attribute) and isinstance(node.value, (ast.Name, ast.Attribute)):
+        return f"{format_annotation(node.value)}.{node.attr}"
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if value is None:
+            return 'None'
+        if isinstance(value, str) and node.kind is None and value.isprintable() and not any(q in value for q in '\'"\\'):
+            return f"'{value}'"
+    return ast.unparse(node)
+
 def get_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
     """Extract function signature from AST node"""
     args_list = []
@@ -53,34 +268,53 @@ def get_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
     for arg in node.args.args:
         arg_str = arg.arg
         if arg.annotation:
-            arg_str += f': {ast.unparse(arg.annotation)}'
+            arg_str += f': {format_annotation(arg.annotation)}'
         args_list.append(arg_str)
 
     return_annotation = ''
     if node.returns:
-        return_annotation = f' -> {ast.unparse(node.returns)}'
+        return_annotation = f' -> {format_annotation(node.returns)}'
 
     return f"{node.name}({', '.join(args_list)}){return_annotation}"
 
-def extract_imports(tree: ast.AST) -> List[Dict[str, Any]]:
-    """Extract import statements from AST"""
+# try/except* (ast.TryStar) exists from Python 3.11 and has the same block fields
+TRY_NODES = (ast.Try, ast.TryStar) if hasattr(ast, 'TryStar') else (ast.Try,)
+
+def import_entries(node: ast.Import | ast.ImportFrom) -> List[Dict[str, Any]]:
+    """Extract import entries from a single import statement"""
+    if isinstance(node, ast.Import):
+        return [{
+            'source': alias.name,
+            'imported': alias.asname if alias.asname else alias.name
+        } for alias in node.names]
+
+    module = node.module if node.module else ''
+    return [{
+        'source': module,
+        'imported': alias.name,
+        'alias': alias.asname if alias.asname else None
+    } for alias in node.names]
+
+def extract_imports(statements: List[ast.stmt]) -> List[Dict[str, Any]]:
+    """Extract module-level imports, including those guarded by if/try blocks
+
+    Imports inside functions and classes are not indexed, so only statement
+    lists are scanned instead of walking every node in the module.
+    """
     imports = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append({
-                    'source': alias.name,
-                    'imported': alias.asname if alias.asname else alias.name
-                })
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module if node.module else ''
-            for alias in node.names:
-                imports.append({
-                    'source': module,
-                    'imported': alias.name,
-                    'alias': alias.asname if alias.asname else None
-                })
+    for node in statements:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.extend(import_entries(node))
+        elif isinstance(node, ast.If):
+            imports.extend(extract_imports(node.body))
+            imports.extend(extract_imports(node.orelse))
+        elif isinstance(node, TRY_NODES):
+            imports.extend(extract_imports(node.body))
+            for handler in node.handlers:
+                imports.extend(extract_imports(handler.body))
+            imports.extend(extract_imports(node.orelse))
+            imports.extend(extract_imports(node.finalbody))
 
     return imports
 
@@ -97,12 +331,14 @@ def extract_calls(node: ast.AST) -> List[str]:
 
     return calls
 
-async def parse_python_ast(code: str, file_path: str) -> Dict[str, Any]:
-    """Parse Python code and return CodeNode array"""
+def parse_python_ast(code: str, file_path: str) -> Dict[str, Any]:
+    """Parse Python code and return CodeNode array (CPU-bound, run off the event loop)"""
     try:
         tree = ast.parse(code)
         nodes = []
 
+        # Only function/method subtrees are walked (for calls); imports come from
+        # a scan of module-level statements
         for node in tree.body:
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 nodes.append({
@@ -138,7 +374,7 @@ async def parse_python_ast(code: str, file_path: str) -> Dict[str, Any]:
                     'methods': methods
                 })
 
-        imports = extract_imports(tree)
+        imports = extract_imports(tree.body)
 
         return {
             'nodes': nodes,
@@ -150,131 +386,222 @@ async def parse_python_ast(code: str, file_path: str) -> Dict[str, Any]:
     except Exception as e:
         raise Exception(f"Failed to parse Python AST: {str(e)}")
 
-async def process_request(crawler, request):
-    """Process a single crawl request"""
+_ast_cache: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+# parse_python requests run in worker threads, so guard the LRU bookkeeping
+_ast_cache_lock = threading.Lock()
+
+def parse_python_ast_cached(code: str, file_path: str) -> Dict[str, Any]:
+    """parse_python_ast with an LRU cache keyed on a BLAKE2b digest of the source"""
+    if len(code) < AST_CACHE_MIN_CODE_LENGTH:
+        return parse_python_ast(code, file_path)
+
+    key = hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _ast_cache_lock:
+        cached = _ast_cache.get(key)
+        if cached is not None:
+            _ast_cache.move_to_end(key)
+            return cached
+
+    # Parse outside the lock; results don't depend on file_path, and failures aren't cached
+    result = parse_python_ast(code, file_path)
+
+    with _ast_cache_lock:
+        _ast_cache[key] = result
+        if len(_ast_cache) > AST_CACHE_MAX_ENTRIES:
+            _ast_cache.popitem(last=False)
+
+    return result
+
+async def process_request(batcher: CrawlBatcher, request) -> Dict[str, Any]:
+    """Process a single crawl request and return its result (raises on failure)"""
+    params = request.get('params', {})
+    url = params.get('url')
+
+    if not url:
+        raise ValueError('URL parameter is required')
+
+    # Perform async crawl (batched with other concurrent crawl requests)
+    result = await batcher.crawl(url)
+
+    if not result.success:
+        raise Exception(f"Crawl failed: {result.error_message}")
+
+    # Extract title from metadata (crawl4ai 0.7.8 stores title in metadata dict)
+    title = ''
+    if result.metadata and isinstance(result.metadata, dict):
+        title = result.metadata.get('title', '')
+
+    # Get markdown content (crawl4ai 0.7.8)
+    markdown = result.markdown or result.cleaned_html or ''
+
+    # Extract links - crawl4ai 0.7.8 returns dict with 'internal' and 'external' keys
+    # Each link is an object with href, text, title, etc. - extract just href strings
+    all_links = [
+        link if isinstance(link, str) else link.get('href', '')
+        for link in combine_links(result.links)
+        if isinstance(link, (str, dict))
+    ]
+
+    return {
+        'pages': [{
+            'url': url,
+            'title': title,
+            'content': markdown,
+            'html': result.html or '',
+            'links': all_links,
+            'crawledAt': '',  # crawl4ai 0.7.8 doesn't provide timestamp
+        }]
+    }
+
+async def handle_single(crawlers: Crawlers, batcher: CrawlBatcher, request) -> Dict[str, Any] | None:
+    """Dispatch a single JSON-RPC request and return its response (None for unknown methods)"""
+    # Bound once so every failure below can answer with the request's id
+    req_id = request.get('id') if isinstance(request, dict) else None
+
     try:
+        method = request.get('method')
         params = request.get('params', {})
-        url = params.get('url')
-
-        if not url:
-            raise ValueError('URL parameter is required')
-
-        # Perform async crawl
-        result = await crawler.arun(url=url)
-
-        if not result.success:
-            raise Exception(f"Crawl failed: {result.error_message}")
-
-        # Extract title from metadata (crawl4ai 0.7.8 stores title in metadata dict)
-        title = ''
-        if result.metadata and isinstance(result.metadata, dict):
-            title = result.metadata.get('title', '')
-
-        # Get markdown content (crawl4ai 0.7.8)
-        markdown = result.markdown or result.cleaned_html or ''
-
-        # Extract links - crawl4ai 0.7.8 returns dict with 'internal' and 'external' keys
-        # Each link is an object with href, text, title, etc. - extract just href strings
-        all_links = []
-        if isinstance(result.links, dict):
-            internal = result.links.get('internal', [])
-            external = result.links.get('external', [])
-            # Extract href from link objects (crawl4ai 0.7.8 returns objects, not strings)
-            for link in internal + external:
-                if isinstance(link, dict):
-                    all_links.append(link.get('href', ''))
-                elif isinstance(link, str):
-                    all_links.append(link)
-
-        response = {
-            'jsonrpc': '2.0',
-            'id': request.get('id'),
-            'result': {
-                'pages': [{
-                    'url': url,
-                    'title': title,
-                    'content': markdown,
-                    'html': result.html or '',
-                    'links': all_links,
-                    'crawledAt': '',  # crawl4ai 0.7.8 doesn't provide timestamp
-                }]
-            }
-        }
-        print(json.dumps(response), flush=True)
+
+        if method == 'crawl':
+            result = await process_request(batcher, request)
+
+        elif method == 'fetch_headless':
+            url = params.get('url')
+            if not url:
+                raise ValueError('URL parameter is required')
+
+            result = await fetch_headless(await crawlers.headless(), url)
+
+        elif method == 'parse_python':
+            code = params.get('code')
+            file_path = params.get('filePath', '<unknown>')
+
+            if not code:
+                raise ValueError('code parameter is required')
+
+            # Parse in a worker thread so in-flight crawls keep making progress
+            result = await asyncio.to_thread(parse_python_ast_cached, code, file_path)
+
+        else:
+            return None
+
+        return ok_response(req_id, result)
     except Exception as e:
-        error_response = {
-            'jsonrpc': '2.0',
-            'id': request.get('id') if isinstance(request, dict) else None,
-            'error': {'code': -1, 'message': str(e)}
-        }
-        print(json.dumps(error_response), flush=True)
+        return error_response(req_id, str(e))
+
+async def handle_request(crawlers: Crawlers, batcher: CrawlBatcher, slots: asyncio.Semaphore, line: bytes):
+    """Parse a JSON-RPC request line (single request or batch) and emit its response
+
+    Called holding one of the concurrency slots, which it releases when done.
+    """
+    holding_slot = True
+    try:
+        request = orjson.loads(line)
+
+        if isinstance(request, list):
+            # JSON-RPC batch: run the requests concurrently and answer with one array.
+            # Note the TypeScript bridge only reads lines starting with '{', so it
+            # would drop this array response - batching is for other clients.
+            if not request:
+                raise ValueError('Batch request must not be empty')
+
+            # Trade the line's slot for one slot per entry, so a batch can't exceed
+            # MAX_CONCURRENT_REQUESTS (and can't deadlock waiting on its own slot)
+            slots.release()
+            holding_slot = False
+
+            async def handle_limited(item):
+                async with slots:
+                    return await handle_single(crawlers, batcher, item)
+
+            responses = await asyncio.gather(*(handle_limited(item) for item in request))
+            responses = [response for response in responses if response is not None]
+            if responses:
+                emit(responses)
+        else:
+            response = await handle_single(crawlers, batcher, request)
+            if response is not None:
+                emit(response)
+
+    except Exception as e:
+        # Malformed line - there is no request id to answer to
+        emit(error_response(None, str(e)))
+    finally:
+        if holding_slot:
+            slots.release()
+
+async def read_stream_line(reader: asyncio.StreamReader) -> bytes:
+    """Read one line from stdin, discarding lines longer than STDIN_LINE_LIMIT (raises ValueError)"""
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+        # Final line without a trailing newline, or b'' at EOF
+        return e.partial
+    except asyncio.LimitOverrunError:
+        pass
+
+    # Skip the rest of the oversized line so the following request still parses
+    try:
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                break
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+    except asyncio.IncompleteReadError:
+        pass
+
+    raise ValueError(f'Request line exceeds {STDIN_LINE_LIMIT} bytes')
+
+async def open_stdin():
+    """Return an async readline() for stdin that doesn't block the event loop"""
+    loop = asyncio.get_running_loop()
+    mode = os.fstat(sys.stdin.fileno()).st_mode
+
+    if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode):
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+        return functools.partial(read_stream_line, reader)
+
+    # connect_read_pipe rejects regular files (e.g. `< requests.jsonl`), so read those in a thread
+    return functools.partial(loop.run_in_executor, None, sys.stdin.buffer.readline)
 
 async def main():
     """Main async loop processing stdin requests"""
-    # Disable verbose logging in crawl4ai
-    async with AsyncWebCrawler(verbose=False) as crawler:
-        for line in sys.stdin:
+    async with contextlib.AsyncExitStack() as stack:
+        crawlers = Crawlers(stack)
+        batcher = CrawlBatcher(crawlers)
+        stack.push_async_callback(batcher.close)
+
+        # Read stdin without blocking the event loop so in-flight crawls keep progressing
+        readline = await open_stdin()
+
+        # Each request runs as its own task; the semaphore caps how many are in flight
+        slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        pending = set()
+
+        while True:
+            # Raw bytes - orjson parses UTF-8 directly and tolerates the trailing newline
             try:
-                request = json.loads(line.strip())
-                method = request.get('method')
-
-                if method == 'crawl':
-                    await process_request(crawler, request)
-                elif method == 'fetch_headless':
-                    # Handle headless fetch request
-                    try:
-                        params = request.get('params', {})
-                        url = params.get('url')
-                        if not url:
-                            raise ValueError('URL parameter is required')
-
-                        result = await fetch_headless(url)
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request.get('id'),
-                            'result': result
-                        }
-                        print(json.dumps(response), flush=True)
-                    except Exception as e:
-                        error_response = {
-                            'jsonrpc': '2.0',
-                            'id': request.get('id'),
-                            'error': {'code': -1, 'message': str(e)}
-                        }
-                        print(json.dumps(error_response), flush=True)
-
-                elif method == 'parse_python':
-                    # Handle Python AST parsing request
-                    try:
-                        params = request.get('params', {})
-                        code = params.get('code')
-                        file_path = params.get('filePath', '<unknown>')
-
-                        if not code:
-                            raise ValueError('code parameter is required')
-
-                        result = await parse_python_ast(code, file_path)
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request.get('id'),
-                            'result': result
-                        }
-                        print(json.dumps(response), flush=True)
-                    except Exception as e:
-                        error_response = {
-                            'jsonrpc': '2.0',
-                            'id': request.get('id'),
-                            'error': {'code': -1, 'message': str(e)}
-                        }
-                        print(json.dumps(error_response), flush=True)
-
-            except Exception as e:
-                error_response = {
-                    'jsonrpc': '2.0',
-                    'id': request.get('id') if isinstance(request, dict) else None,
-                    'error': {'code': -1, 'message': str(e)}
-                }
-                print(json.dumps(error_response), flush=True)
+                line = await readline()
+            except ValueError as e:
+                # Oversized line (already discarded) - report it and keep serving
+                emit(error_response(None, str(e)))
+                continue
+            if not line:
+                break
+            # Blank lines carry no request - skip them without spawning a task
+            if line == b'\n' or line == b'\r\n':
+                continue
+
+            # Waiting for a slot before reading on keeps stdin backpressured
+            await slots.acquire()
+            task = asyncio.create_task(handle_request(crawlers, batcher, slots, line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        # Drain in-flight requests before the crawlers shut down
+        await asyncio.gather(*pending)
 
 if __name__ == '__main__':
     asyncio.run(main())
@@ -4,7 +4,7 @@
  */
 
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
-import { PythonBridge } from './bridge.js';
+import { MAX_REQUEST_LINE_BYTES, PythonBridge } from './bridge.js';
 import type { ChildProcess } from 'node:child_process';
 import type { Interface as ReadlineInterface, ReadLineOptions } from 'node:readline';
 import { EventEmitter } from 'node:events';
@@ -646,6 +646,17 @@ describe('PythonBridge', () => {
     });
   });
 
+  describe('Request Size Limit', () => {
+    it('should reject parse requests over the worker line limit without sending them', async () => {
+      await bridge.start();
+
+      const code = 'x'.repeat(MAX_REQUEST_LINE_BYTES);
+
+      await expect(bridge.parsePython(code, 'huge.py')).rejects.toThrow('too large');
+      expect(mockProcess.stdin.write).not.toHaveBeenCalled();
+    });
+  });
+
   describe('Stop Functionality', () => {
     it('should kill process on stop', async () => {
       await bridge.start();
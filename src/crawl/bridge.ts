@@ -15,6 +15,12 @@ import { createLogger } from '../logging/index.js';
 
 const logger = createLogger('python-bridge');
 
+/**
+ * Longest request line the worker accepts (STDIN_LINE_LIMIT in python/crawl_worker.py).
+ * The worker answers longer lines with an id-less error, so they are rejected here instead.
+ */
+export const MAX_REQUEST_LINE_BYTES = 64 * 1024 * 1024;
+
 // Re-export for backwards compatibility
 export type { CrawledLink, ParsePythonResult };
 
@@ -232,6 +238,13 @@ export class PythonBridge {
       method: 'parse_python',
       params: { code, filePath },
     };
+    const line = `${JSON.stringify(request)}\n`;
+
+    if (Buffer.byteLength(line) > MAX_REQUEST_LINE_BYTES) {
+      throw new Error(
+        `Python source too large to parse (over ${String(MAX_REQUEST_LINE_BYTES)} bytes): ${filePath}`
+      );
+    }
 
     return new Promise((resolve, reject) => {
       const timeout = setTimeout(() => {
@@ -255,7 +268,7 @@ export class PythonBridge {
         reject(new Error('Python bridge process not available'));
         return;
       }
-      this.process.stdin.write(`${JSON.stringify(request)}\n`);
+      this.process.stdin.write(line);
     });
   }
 
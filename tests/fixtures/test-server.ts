@@ -1,5 +1,8 @@
 import { createServer, type IncomingMessage, type ServerResponse, type Server } from 'node:http';
 
+/** Delay before /slow responds, in milliseconds */
+export const SLOW_PAGE_DELAY_MS = 3000;
+
 /**
  * Local HTTP server for testing crawl functionality.
  * Serves static HTML pages for deterministic, fast testing without network dependencies.
@@ -249,6 +252,26 @@ export class TestHTMLServer {
       return;
     }
 
+    // Slow page, for checking that concurrent crawls don't wait on each other
+    if (url === '/slow') {
+      setTimeout(() => {
+        res.writeHead(200, { 'Content-Type': 'text/html' });
+        res.end(`
+          <!DOCTYPE html>
+          <html>
+            <head>
+              <title>Slow Page</title>
+            </head>
+            <body>
+              <h1>Slow Page</h1>
+              <p>This page is served after a delay.</p>
+            </body>
+          </html>
+        `);
+      }, SLOW_PAGE_DELAY_MS);
+      return;
+    }
+
     // 404 Not Found
     res.writeHead(404, { 'Content-Type': 'text/html' });
     res.end(`
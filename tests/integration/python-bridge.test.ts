@@ -1,6 +1,6 @@
 import { describe, it, expect, beforeAll, beforeEach, afterAll, afterEach } from 'vitest';
 import { PythonBridge } from '../../src/crawl/bridge.js';
-import { TestHTMLServer } from '../fixtures/test-server.js';
+import { SLOW_PAGE_DELAY_MS, TestHTMLServer } from '../fixtures/test-server.js';
 
 describe('Python Bridge Integration Tests', () => {
   let bridge: PythonBridge;
@@ -158,6 +158,39 @@ describe('Python Bridge Integration Tests', () => {
       await expect(bridge.crawl('not-a-valid-url')).rejects.toThrow();
     }, 30000);
 
+    it('keeps a failed crawl from failing concurrent crawls', async () => {
+      // Concurrent requests are batched together in the worker
+      const [page1, invalid, page2] = await Promise.allSettled([
+        bridge.crawl(`${baseUrl}/page1`),
+        bridge.crawl('not-a-valid-url'),
+        bridge.crawl(`${baseUrl}/page2`),
+      ]);
+
+      expect(invalid.status).toBe('rejected');
+      expect(page1.status).toBe('fulfilled');
+      expect(page2.status).toBe('fulfilled');
+      if (page1.status === 'fulfilled' && page2.status === 'fulfilled') {
+        expect(page1.value.pages[0].url).toContain('/page1');
+        expect(page2.value.pages[0].url).toContain('/page2');
+      }
+    }, 30000);
+
+    it('does not hold fast crawls back for a slow concurrent crawl', async () => {
+      const finishedAt = new Map<string, number>();
+      const start = Date.now();
+      const crawlTimed = async (path: string): Promise<void> => {
+        await bridge.crawl(`${baseUrl}${path}`);
+        finishedAt.set(path, Date.now() - start);
+      };
+
+      await Promise.all([crawlTimed('/slow'), crawlTimed('/page1'), crawlTimed('/page2')]);
+
+      const slow = finishedAt.get('/slow') ?? 0;
+      expect(slow).toBeGreaterThanOrEqual(SLOW_PAGE_DELAY_MS);
+      expect(finishedAt.get('/page1')).toBeLessThan(slow);
+      expect(finishedAt.get('/page2')).toBeLessThan(slow);
+    }, 30000);
+
     it('handles 404 pages', async () => {
       // Should not throw, but might return empty or error
       const result = await bridge.crawl(`${baseUrl}/nonexistent`);
@@ -0,0 +1,193 @@
+import { describe, it, expect, afterEach } from 'vitest';
+import { spawn, type ChildProcess } from 'node:child_process';
+import { mkdtemp, open, rm, writeFile } from 'node:fs/promises';
+import { tmpdir } from 'node:os';
+import { join } from 'node:path';
+import * as readline from 'node:readline';
+import { MAX_REQUEST_LINE_BYTES } from '../../src/crawl/bridge.js';
+
+/**
+ * Python Worker Protocol Integration Tests
+ *
+ * Spawns python/crawl_worker.py directly and speaks raw JSON-RPC lines to it,
+ * covering protocol paths the PythonBridge never exercises (batch requests,
+ * responses without an id, stdin that is not a pipe). Only parse_python is
+ * used, so crawl4ai is not needed.
+ */
+describe('Python Worker Protocol', () => {
+  interface JSONRPCResponse {
+    jsonrpc: string;
+    id: string | null;
+    result?: { nodes?: Array<{ name: string }> };
+    error?: { code: number; message: string };
+  }
+
+  interface WorkerClient {
+    proc: ChildProcess;
+    send: (line: string) => void;
+    nextLine: () => Promise<unknown>;
+  }
+
+  let worker: WorkerClient | null = null;
+
+  afterEach(() => {
+    worker?.proc.kill();
+    worker = null;
+  });
+
+  /**
+   * Start the worker and return helpers to write request lines and read response lines
+   */
+  function startWorker(): WorkerClient {
+    const proc = spawn('python3', ['python/crawl_worker.py'], {
+      stdio: ['pipe', 'pipe', 'pipe'],
+    });
+
+    const rl = readline.createInterface({ input: proc.stdout! });
+    const lines: unknown[] = [];
+    const waiters: Array<(line: unknown) => void> = [];
+
+    rl.on('line', (line: string) => {
+      const parsed: unknown = JSON.parse(line);
+      const waiter = waiters.shift();
+      if (waiter !== undefined) {
+        waiter(parsed);
+      } else {
+        lines.push(parsed);
+      }
+    });
+
+    return {
+      proc,
+      send: (line: string) => {
+        proc.stdin!.write(`${line}\n`);
+      },
+      nextLine: () =>
+        new Promise((resolve) => {
+          if (lines.length > 0) {
+            resolve(lines.shift());
+          } else {
+            waiters.push(resolve);
+          }
+        }),
+    };
+  }
+
+  function parseRequest(id: string, name: string): Record<string, unknown> {
+    return {
+      jsonrpc: '2.0',
+      id,
+      method: 'parse_python',
+      params: { code: `def ${name}():\n    pass\n`, filePath: `${name}.py` },
+    };
+  }
+
+  describe('Batch Requests', () => {
+    it('answers a batch with one array of responses in request order', async () => {
+      worker = startWorker();
+      worker.send(JSON.stringify([parseRequest('a', 'first'), parseRequest('b', 'second')]));
+
+      const responses = (await worker.nextLine()) as JSONRPCResponse[];
+
+      expect(responses).toBeInstanceOf(Array);
+      expect(responses.map((r) => r.id)).toEqual(['a', 'b']);
+      expect(responses[0].result?.nodes?.[0].name).toBe('first');
+      expect(responses[1].result?.nodes?.[0].name).toBe('second');
+    }, 30000);
+
+    it('rejects an empty batch with a null-id error', async () => {
+      worker = startWorker();
+      worker.send('[]');
+
+      const response = (await worker.nextLine()) as JSONRPCResponse;
+
+      expect(response.id).toBeNull();
+      expect(response.error?.message).toContain('must not be empty');
+    }, 30000);
+
+    it('answers a non-object batch entry with a null-id error', async () => {
+      worker = startWorker();
+      worker.send(JSON.stringify([parseRequest('a', 'first'), 42]));
+
+      const responses = (await worker.nextLine()) as JSONRPCResponse[];
+
+      expect(responses).toHaveLength(2);
+      expect(responses[0].id).toBe('a');
+      expect(responses[0].result).toBeDefined();
+      expect(responses[1].id).toBeNull();
+      expect(responses[1].error).toBeDefined();
+    }, 30000);
+
+    it('serves batches larger than the concurrency limit without stalling', async () => {
+      worker = startWorker();
+      // More entries (and batch lines) than MAX_CONCURRENT_REQUESTS, followed by a single request
+      const batch = Array.from({ length: 12 }, (_, i) =>
+        parseRequest(`b${String(i)}`, `fn${String(i)}`)
+      );
+      for (let i = 0; i < 10; i++) {
+        worker.send(JSON.stringify(batch));
+      }
+      worker.send(JSON.stringify(parseRequest('single', 'after')));
+
+      const received: unknown[] = [];
+      for (let i = 0; i < 11; i++) {
+        received.push(await worker.nextLine());
+      }
+
+      const batches = received.filter((line) => Array.isArray(line)) as JSONRPCResponse[][];
+      expect(batches).toHaveLength(10);
+      batches.forEach((responses) => {
+        expect(responses).toHaveLength(12);
+        expect(responses.every((r) => r.result !== undefined)).toBe(true);
+      });
+      expect(received).toContainEqual(expect.objectContaining({ id: 'single' }));
+    }, 30000);
+  });
+
+  describe('Request Lines', () => {
+    it('reports an oversized line and keeps serving later requests', async () => {
+      worker = startWorker();
+      worker.send(`"${'x'.repeat(MAX_REQUEST_LINE_BYTES)}"`);
+      worker.send(JSON.stringify(parseRequest('after', 'after')));
+
+      const oversized = (await worker.nextLine()) as JSONRPCResponse;
+      const next = (await worker.nextLine()) as JSONRPCResponse;
+
+      expect(oversized.id).toBeNull();
+      expect(oversized.error?.message).toContain('exceeds');
+      expect(next.id).toBe('after');
+      expect(next.result?.nodes?.[0].name).toBe('after');
+    }, 30000);
+
+    it('reads requests from a file redirected to stdin', async () => {
+      const tempDir = await mkdtemp(join(tmpdir(), 'python-worker-test-'));
+      try {
+        const requestsPath = join(tempDir, 'requests.jsonl');
+        const lines = [parseRequest('a', 'first'), parseRequest('b', 'second')].map(
+          (request) => `${JSON.stringify(request)}\n`
+        );
+        await writeFile(requestsPath, lines.join(''));
+        const requests = await open(requestsPath);
+
+        const proc = spawn('python3', ['python/crawl_worker.py'], {
+          stdio: [requests.fd, 'pipe', 'pipe'],
+        });
+        await requests.close();
+
+        const rl = readline.createInterface({ input: proc.stdout! });
+        const responses: JSONRPCResponse[] = [];
+        rl.on('line', (line: string) => {
+          responses.push(JSON.parse(line) as JSONRPCResponse);
+        });
+        const exitCode = await new Promise<number | null>((resolve) => {
+          proc.on('close', resolve);
+        });
+
+        expect(exitCode).toBe(0);
+        expect(responses.map((r) => r.id).sort()).toEqual(['a', 'b']);
+      } finally {
+        await rm(tempDir, { recursive: true, force: true });
+      }
+    }, 30000);
+  });
+});